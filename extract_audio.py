@@ -10,9 +10,13 @@ import os
 import sys
 import subprocess
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-def extract_audio(video_path, output_path=None, audio_format="mp3", bitrate="128k", sample_rate="44100"):
+# Video formats recognized when scanning a directory in batch mode
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v", ".3gp", ".flv", ".wmv"}
+
+def extract_audio(video_path, output_path=None, audio_format="mp3", bitrate="128k", sample_rate="44100", threads=None):
     """
     Extract audio from a video file using ffmpeg.
     
@@ -22,6 +26,7 @@ def extract_audio(video_path, output_path=None, audio_format="mp3", bitrate="128
         audio_format (str): Output audio format (mp3, wav, etc.)
         bitrate (str): Audio bitrate (e.g., "128k", "192k")
         sample_rate (str): Audio sample rate (e.g., "44100", "48000")
+        threads (int): Optional cap on ffmpeg's thread count (used in batch mode)
     
     Returns:
         str: Path to the extracted audio file
@@ -41,8 +46,12 @@ def extract_audio(video_path, output_path=None, audio_format="mp3", bitrate="128
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Build ffmpeg command
+    # -loglevel error -nostats keeps stderr bounded to actual errors instead
+    # of one progress line per frame (which can grow unbounded on long videos)
     cmd = [
         "ffmpeg",
+        "-loglevel", "error",
+        "-nostats",
         "-i", str(video_path),  # Input video
         "-vn",                  # No video output
         "-acodec", f"lib{audio_format}lame" if audio_format == "mp3" else "copy",
@@ -51,6 +60,9 @@ def extract_audio(video_path, output_path=None, audio_format="mp3", bitrate="128
         "-y",                   # Overwrite output file
         str(output_path)        # Output audio file
     ]
+    if threads:
+        # Cap per-process threads so parallel batch workers don't oversubscribe
+        cmd[1:1] = ["-threads", str(threads)]
     
     # For WAV format, use different codec
     if audio_format == "wav":
@@ -60,8 +72,11 @@ def extract_audio(video_path, output_path=None, audio_format="mp3", bitrate="128
         print(f"🎵 Extracting audio from: {video_path.name}")
         print(f"📁 Output: {output_path}")
         
-        # Run ffmpeg command
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        # Run ffmpeg command; stdout is discarded and stderr stays small
+        # because of -loglevel error, but is still captured for failures
+        result = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+        )
         
         print(f"✅ Audio extraction completed successfully!")
         print(f"📊 Output size: {output_path.stat().st_size / (1024*1024):.1f} MB")
@@ -80,11 +95,64 @@ def extract_audio(video_path, output_path=None, audio_format="mp3", bitrate="128
         print("   Ubuntu: sudo apt update && sudo apt install ffmpeg")
         raise
 
+def _extract_one(task):
+    """Worker entry point for batch mode (must be picklable for the pool)."""
+    video_path, audio_format, bitrate, sample_rate = task
+    return extract_audio(
+        video_path=video_path,
+        audio_format=audio_format,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        threads=2
+    )
+
+def extract_batch(directory, audio_format="mp3", bitrate="128k", sample_rate="44100", jobs=None):
+    """
+    Extract audio from every video file under a directory, fanning the ffmpeg
+    invocations out across a process pool.
+    
+    Args:
+        directory (str): Directory to scan recursively for video files
+        audio_format (str): Output audio format (mp3, wav, etc.)
+        bitrate (str): Audio bitrate (e.g., "128k", "192k")
+        sample_rate (str): Audio sample rate (e.g., "44100", "48000")
+        jobs (int): Number of parallel workers (default: half the CPU count)
+    
+    Returns:
+        list: Paths of the extracted audio files
+    """
+    directory = Path(directory)
+    videos = sorted(p for p in directory.rglob("*") if p.suffix.lower() in VIDEO_EXTENSIONS)
+    if not videos:
+        print(f"❌ No video files found in {directory}")
+        return []
+    
+    jobs = jobs or max((os.cpu_count() or 2) // 2, 1)
+    print(f"🎬 Found {len(videos)} video file(s), extracting with {jobs} parallel job(s)")
+    
+    tasks = [(str(p), audio_format, bitrate, sample_rate) for p in videos]
+    outputs = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_extract_one, task): task[0] for task in tasks}
+        for i, future in enumerate(as_completed(futures), 1):
+            video = futures[future]
+            try:
+                outputs.append(future.result())
+                print(f"✅ [{i}/{len(videos)}] {Path(video).name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ [{i}/{len(videos)}] {Path(video).name}: {e}")
+    
+    if failed:
+        print(f"⚠️  {failed}/{len(videos)} file(s) failed")
+    return outputs
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract audio from video files for Whisper transcription"
     )
-    parser.add_argument("video_path", help="Path to the input video file")
+    parser.add_argument("video_path", help="Path to the input video file, or a directory for batch mode")
     parser.add_argument("-o", "--output", help="Output audio file path")
     parser.add_argument("-f", "--format", default="mp3", choices=["mp3", "wav"], 
                       help="Output audio format (default: mp3)")
@@ -92,10 +160,25 @@ def main():
                       help="Audio bitrate (default: 128k)")
     parser.add_argument("-r", "--sample-rate", default="44100", 
                       help="Audio sample rate (default: 44100)")
+    parser.add_argument("-j", "--jobs", type=int, 
+                      help="Parallel workers in batch mode (default: half the CPU count)")
     
     args = parser.parse_args()
     
     try:
+        if Path(args.video_path).is_dir():
+            outputs = extract_batch(
+                directory=args.video_path,
+                audio_format=args.format,
+                bitrate=args.bitrate,
+                sample_rate=args.sample_rate,
+                jobs=args.jobs
+            )
+            if not outputs:
+                sys.exit(1)
+            print(f"\n🎯 {len(outputs)} audio file(s) ready for transcription!")
+            return
+        
         output_file = extract_audio(
             video_path=args.video_path,
             output_path=args.output,
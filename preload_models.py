@@ -30,9 +30,14 @@ WHISPER_MODELS = {
     "small": {"size": "244M", "vram": "~2 GB", "speed": "~4x", "description": "Better quality, moderate speed"},
     "medium": {"size": "769M", "vram": "~5 GB", "speed": "~2x", "description": "High quality, slower processing"},
     "large": {"size": "1550M", "vram": "~10 GB", "speed": "1x", "description": "Best quality, slowest processing"},
-    "turbo": {"size": "809M", "vram": "~6 GB", "speed": "~8x", "description": "Optimized for speed with minimal quality loss"}
+    "turbo": {"size": "809M", "vram": "~6 GB", "speed": "~8x", "description": "Optimized for speed with minimal quality loss"},
+    "distil-large-v3": {"size": "756M", "vram": "~4 GB", "speed": "~12x", "description": "Distil-Whisper; ~2x faster than large-v3 (faster-whisper backend only)"}
 }
 
+# Models that only exist as CTranslate2 conversions and are fetched through
+# faster-whisper instead of openai-whisper
+FASTER_WHISPER_ONLY = {"distil-large-v3"}
+
 def preload_model(model_name: str, cache_dir: str = None) -> bool:
     """
     Pre-download and cache a specific Whisper model.
@@ -58,17 +63,21 @@ def preload_model(model_name: str, cache_dir: str = None) -> bool:
             cache_path.mkdir(parents=True, exist_ok=True)
             logger.info(f"Using cache directory: {cache_path.absolute()}")
         
-        # Download/load the model (this will cache it locally)
-        model = whisper.load_model(model_name, download_root=cache_dir)
+        if model_name in FASTER_WHISPER_ONLY:
+            # CT2-only conversion; openai-whisper has no checkpoint for it
+            from faster_whisper import download_model
+            download_model(model_name, cache_dir=cache_dir)
+        else:
+            # Download/load the model (this will cache it locally)
+            model = whisper.load_model(model_name, download_root=cache_dir)
+            # Clean up model from memory
+            del model
         
         logger.info(f"✅ Model '{model_name}' successfully downloaded and cached!")
         logger.info(f"   Size: {model_info['size']}")
         logger.info(f"   VRAM: {model_info['vram']}")
         logger.info(f"   Speed: {model_info['speed']} relative to large model")
         
-        # Clean up model from memory
-        del model
-        
         return True
         
     except Exception as e: